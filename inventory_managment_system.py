@@ -3,8 +3,37 @@
 
 
 import json
+import mmap
+import os
+import pickle
+import sys
+import time
 from abc import ABC, abstractmethod
-from datetime import datetime
+from collections import OrderedDict, defaultdict
+from datetime import date, datetime
+
+try:
+    import orjson
+except ImportError:  # optional fast codec, fall back to the stdlib json module
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # optional streaming parser, loads fall back to reading the whole file
+    ijson = None
+
+
+# ---------------- Date Helper ----------------
+# [today, monotonic time it was read]; groceries share one clock read per minute
+_TODAY_CACHE = [None, 0.0]
+
+
+def today_cached():
+    now = time.monotonic()
+    if _TODAY_CACHE[0] is None or now - _TODAY_CACHE[1] > 60:
+        _TODAY_CACHE[0] = date.today()
+        _TODAY_CACHE[1] = now
+    return _TODAY_CACHE[0]
 
 
 # ---------------- Custom Exceptions ----------------
@@ -22,23 +51,55 @@ class InvalidProductDataError(Exception):
 
 # ---------------- Abstract Product Class ----------------
 class Product(ABC):
+    __slots__ = ("_product_id", "_name", "_name_lower", "_price", "_quantity_in_stock", "_inventory", "_str_cache")
+    _type_tag = None  # lowercase type name used by Inventory.search_by_type, set per subclass
+
     def __init__(self, product_id, name, price, quantity):
-        self._product_id = product_id
-        self._name = name
-        self._price = price
-        self._quantity_in_stock = quantity
+        # interned so id lookups and repeated names share one string object; other id types are kept as-is
+        self._product_id = sys.intern(product_id) if isinstance(product_id, str) else product_id
+        if not isinstance(name, str):
+            raise InvalidProductDataError(f"Invalid product name '{name}'.")
+        self._name = sys.intern(name)
+        self._name_lower = name.lower()
+        try:
+            self._price = float(price)
+            if isinstance(quantity, bool):
+                raise TypeError("quantity must be a number, not bool")
+            qty = int(quantity)
+            # int() would silently truncate 2.9 or Decimal("2.9") to 2
+            if not isinstance(quantity, str) and qty != quantity:
+                raise ValueError(f"quantity {quantity} is not a whole number")
+            self._quantity_in_stock = qty
+        except (TypeError, ValueError, OverflowError) as e:
+            raise InvalidProductDataError(f"Invalid price '{price}' or quantity '{quantity}'.") from e
+        self._inventory = None  # set by Inventory.add_product
+        self._str_cache = None
 
     @abstractmethod
-    def __str__(self):
+    def _format(self):
         pass
 
+    def __str__(self):
+        # rendered once and reused until stock changes
+        if self._str_cache is None:
+            self._str_cache = self._format()
+        return self._str_cache
+
+    def _stock_changed(self):
+        self._str_cache = None
+        # the owning inventory caches its total value, so it must hear about direct sells/restocks too
+        if self._inventory is not None:
+            self._inventory._total_value = None
+
     def restock(self, amount):
         self._quantity_in_stock += amount
+        self._stock_changed()
 
     def sell(self, quantity):
         if quantity > self._quantity_in_stock:
             raise InsufficientStockError(f"Only {self._quantity_in_stock} items left in stock.")
         self._quantity_in_stock -= quantity
+        self._stock_changed()
 
     def get_total_value(self):
         return self._price * self._quantity_in_stock
@@ -55,12 +116,15 @@ class Product(ABC):
 
 # ---------------- Electronics ----------------
 class Electronics(Product):
+    __slots__ = ("_brand", "_warranty_years")
+    _type_tag = "electronics"
+
     def __init__(self, product_id, name, price, quantity, brand, warranty_years):
         super().__init__(product_id, name, price, quantity)
         self._brand = brand
         self._warranty_years = warranty_years
 
-    def __str__(self):
+    def _format(self):
         return f"[Electronics] {self._name} (ID: {self._product_id}, Brand: {self._brand}, Warranty: {self._warranty_years} yrs, Price: ${self._price}, Stock: {self._quantity_in_stock})"
 
     def to_dict(self):
@@ -71,16 +135,37 @@ class Electronics(Product):
 
 # ---------------- Grocery ----------------
 class Grocery(Product):
+    __slots__ = ("_expiry_date", "_expiry", "_str_day")
+    _type_tag = "grocery"
+
     def __init__(self, product_id, name, price, quantity, expiry_date):
         super().__init__(product_id, name, price, quantity)
         self._expiry_date = expiry_date  # format: YYYY-MM-DD
+        try:
+            # fromisoformat is fast but also takes forms like 2030-W01-1, so only trust it on the exact shape
+            if len(expiry_date) == 10 and expiry_date[4] == expiry_date[7] == "-":
+                self._expiry = date.fromisoformat(expiry_date)
+            else:
+                self._expiry = datetime.strptime(expiry_date, "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            self._expiry = None
+        self._str_day = None
 
-    def is_expired(self):
-        today = datetime.today().date()
-        return today > datetime.strptime(self._expiry_date, "%Y-%m-%d").date()
+    def is_expired(self, today=None):
+        if self._expiry is None:
+            raise InvalidProductDataError(f"Invalid expiry date '{self._expiry_date}', expected YYYY-MM-DD.")
+        return (today or today_cached()) > self._expiry
 
     def __str__(self):
-        status = "Expired" if self.is_expired() else "Fresh"
+        # the Fresh/Expired status can flip at midnight, so the cache only lives for a day
+        today = today_cached()
+        if today != self._str_day:
+            self._str_cache = None
+            self._str_day = today
+        return super().__str__()
+
+    def _format(self):
+        status = "Expired" if self.is_expired(self._str_day) else "Fresh"
         return f"[Grocery] {self._name} (ID: {self._product_id}, Expiry: {self._expiry_date}, Status: {status}, Price: ${self._price}, Stock: {self._quantity_in_stock})"
 
     def to_dict(self):
@@ -91,12 +176,15 @@ class Grocery(Product):
 
 # ---------------- Clothing ----------------
 class Clothing(Product):
+    __slots__ = ("_size", "_material")
+    _type_tag = "clothing"
+
     def __init__(self, product_id, name, price, quantity, size, material):
         super().__init__(product_id, name, price, quantity)
         self._size = size
         self._material = material
 
-    def __str__(self):
+    def _format(self):
         return f"[Clothing] {self._name} (ID: {self._product_id}, Size: {self._size}, Material: {self._material}, Price: ${self._price}, Stock: {self._quantity_in_stock})"
 
     def to_dict(self):
@@ -105,68 +193,179 @@ class Clothing(Product):
         return data
 
 
+# ---------------- Product Registry ----------------
+# maps the serialized "type" tag to its class and the constructor fields in order
+_PRODUCT_REGISTRY = {
+    "Electronics": (Electronics, ("product_id", "name", "price", "quantity", "brand", "warranty_years")),
+    "Grocery": (Grocery, ("product_id", "name", "price", "quantity", "expiry_date")),
+    "Clothing": (Clothing, ("product_id", "name", "price", "quantity", "size", "material")),
+}
+
+
 # ---------------- Inventory Class ----------------
 class Inventory:
+    _SEARCH_CACHE_SIZE = 128
+
     def __init__(self):
         self._products = {}
+        # product ids per type tag, in a dict used as an insertion-ordered set
+        self._by_type = defaultdict(dict)
+        self._groceries = set()
+        # cached sum of price * quantity; None marks it stale
+        self._total_value = None
+        # lowercase query -> matching products, LRU-bounded and cleared whenever products come or go
+        self._search_cache = OrderedDict()
 
     def add_product(self, product):
-        if product._product_id in self._products:
+        pid = product._product_id
+        if pid in self._products:
             raise DuplicateProductIDError("Product ID already exists.")
-        self._products[product._product_id] = product
+        self._products[pid] = product
+        self._by_type[product._type_tag][pid] = None
+        if isinstance(product, Grocery):
+            self._groceries.add(pid)
+        product._inventory = self
+        self._total_value = None
+        self._search_cache.clear()
 
     def remove_product(self, product_id):
-        self._products.pop(product_id, None)
+        # the one place a product leaves the inventory, so every index is unwound here
+        product = self._products.pop(product_id, None)
+        if product is None:
+            return
+        self._by_type[product._type_tag].pop(product_id, None)
+        if isinstance(product, Grocery):
+            self._groceries.discard(product_id)
+        product._inventory = None
+        self._total_value = None
+        self._search_cache.clear()
 
     def search_by_name(self, name):
-        return [p for p in self._products.values() if name.lower() in p._name.lower()]
+        key = name.lower()
+        hit = self._search_cache.get(key)
+        if hit is not None:
+            self._search_cache.move_to_end(key)
+            return list(hit)
+        # substring match, so no word index can answer it; _name_lower spares a .lower() per product
+        result = [p for p in self._products.values() if key in p._name_lower]
+        self._search_cache[key] = result
+        if len(self._search_cache) > self._SEARCH_CACHE_SIZE:
+            self._search_cache.popitem(last=False)
+        return list(result)
 
     def search_by_type(self, product_type):
-        return [p for p in self._products.values() if p.__class__.__name__.lower() == product_type.lower()]
+        return [self._products[pid] for pid in self._by_type.get(product_type.lower(), ())]
 
     def list_all_products(self):
-        return list(self._products.values())
+        return self._products.values()
 
     def sell_product(self, product_id, quantity):
-        if product_id in self._products:
-            self._products[product_id].sell(quantity)
+        product = self._products.get(product_id)
+        if product is not None:
+            product.sell(quantity)
 
     def restock_product(self, product_id, quantity):
-        if product_id in self._products:
-            self._products[product_id].restock(quantity)
+        product = self._products.get(product_id)
+        if product is not None:
+            product.restock(quantity)
 
     def total_inventory_value(self):
-        return sum(p.get_total_value() for p in self._products.values())
+        # recomputed lazily rather than adjusted in place, so float error never accumulates
+        if self._total_value is None:
+            self.rebuild_totals()
+        return self._total_value
+
+    def rebuild_totals(self):
+        # read the slots directly instead of calling get_total_value() per product
+        self._total_value = sum(p._price * p._quantity_in_stock for p in self._products.values())
+        return self._total_value
 
     def remove_expired_products(self):
-        expired_ids = [pid for pid, p in self._products.items() if isinstance(p, Grocery) and p.is_expired()]
+        today = today_cached()
+        expired_ids = [pid for pid in self._groceries if self._products[pid].is_expired(today)]
         for pid in expired_ids:
-            del self._products[pid]
-
-    def save_to_file(self, filename):
-        with open(filename, "w") as f:
-            json.dump([p.to_dict() for p in self._products.values()], f, indent=4)
+            self.remove_product(pid)
+
+    def save_to_file(self, filename, pretty=False):
+        # orjson can only indent by 2, so pretty output always goes through json for the 4-space layout
+        if orjson is not None and not pretty:
+            with open(filename, "wb") as f:
+                f.write(orjson.dumps([p.to_dict() for p in self._products.values()]))
+            return
+        # raw UTF-8 like orjson, so a file reads back the same whichever codec wrote it
+        with open(filename, "w", encoding="utf-8", buffering=1 << 16) as f:
+            if pretty:
+                json.dump([p.to_dict() for p in self._products.values()], f, indent=4, ensure_ascii=False)
+                return
+            # stream one product at a time instead of building the whole list first
+            f.write("[")
+            first = True
+            for p in self._products.values():
+                if not first:
+                    f.write(",")
+                first = False
+                json.dump(p.to_dict(), f, separators=(",", ":"), ensure_ascii=False)
+            f.write("]")
+
+    @staticmethod
+    def _iter_file_items(filename):
+        if ijson is not None:
+            # objects are handed over as they are parsed, never holding the full list of dicts
+            with open(filename, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:  # mmap refuses empty files
+                    raise json.JSONDecodeError("Expecting value", "", 0)
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    yield from ijson.items(mm, "item", use_float=True)
+        elif orjson is not None:
+            with open(filename, "rb") as f:
+                yield from orjson.loads(f.read())
+        else:
+            with open(filename, "r", encoding="utf-8") as f:
+                yield from json.load(f)
+
+    def _load_items(self, items):
+        # build and check every product first so bad data leaves the inventory untouched
+        products = {}
+        for item in items:
+            cls, fields = _PRODUCT_REGISTRY.get(item['type'], (None, None))
+            if cls is None:
+                raise InvalidProductDataError("Unknown product type.")
+            product = cls(*(item[k] for k in fields))
+            if product._product_id in self._products or product._product_id in products:
+                raise DuplicateProductIDError("Product ID already exists.")
+            products[product._product_id] = product
+        for product in products.values():
+            self.add_product(product)
 
     def load_from_file(self, filename):
         try:
-            with open(filename, "r") as f:
-                data = json.load(f)
-                for item in data:
-                    ptype = item['type']
-                    if ptype == "Electronics":
-                        product = Electronics(item['product_id'], item['name'], item['price'], item['quantity'], item['brand'], item['warranty_years'])
-                    elif ptype == "Grocery":
-                        product = Grocery(item['product_id'], item['name'], item['price'], item['quantity'], item['expiry_date'])
-                    elif ptype == "Clothing":
-                        product = Clothing(item['product_id'], item['name'], item['price'], item['quantity'], item['size'], item['material'])
-                    else:
-                        raise InvalidProductDataError("Unknown product type.")
-                    self.add_product(product)
+            self._load_items(self._iter_file_items(filename))
+        except FileNotFoundError:
+            print("File not found.")
+
+    # binary snapshot of the same dicts as the JSON file; only load files you wrote yourself
+    def save_binary(self, filename):
+        with open(filename, "wb", buffering=1 << 16) as f:
+            pickle.dump([p.to_dict() for p in self._products.values()], f, protocol=5)
+
+    def load_binary(self, filename):
+        try:
+            with open(filename, "rb") as f:
+                items = pickle.load(f)
+            self._load_items(items)
         except FileNotFoundError:
             print("File not found.")
 
 
 # ---------------- CLI Interface ----------------
+# lowercase type typed at the prompt -> (class, [(prompt, converter), ...]) for its extra fields
+PRODUCT_PROMPTS = {
+    "electronics": (Electronics, [("Brand: ", str), ("Warranty (years): ", int)]),
+    "grocery": (Grocery, [("Expiry Date (YYYY-MM-DD): ", str)]),
+    "clothing": (Clothing, [("Size: ", str), ("Material: ", str)]),
+}
+
+
 def menu():
     inv = Inventory()
     while True:
@@ -181,6 +380,8 @@ def menu():
         print("8. Total Inventory Value")
         print("9. Save Inventory to File")
         print("10. Load Inventory from File")
+        print("11. Save Inventory to Binary File")
+        print("12. Load Inventory from Binary File")
         print("0. Exit")
 
         choice = input("Enter choice: ")
@@ -193,35 +394,24 @@ def menu():
                 price = float(input("Price: "))
                 qty = int(input("Quantity: "))
 
-                if ptype == "electronics":
-                    brand = input("Brand: ")
-                    warranty = int(input("Warranty (years): "))
-                    product = Electronics(pid, name, price, qty, brand, warranty)
-
-                elif ptype == "grocery":
-                    expiry = input("Expiry Date (YYYY-MM-DD): ")
-                    product = Grocery(pid, name, price, qty, expiry)
-
-                elif ptype == "clothing":
-                    size = input("Size: ")
-                    material = input("Material: ")
-                    product = Clothing(pid, name, price, qty, size, material)
-
-                else:
+                cls, extras = PRODUCT_PROMPTS.get(ptype, (None, None))
+                if cls is None:
                     print("Invalid product type.")
                     continue
+                args = [conv(input(prompt)) for prompt, conv in extras]
+                product = cls(pid, name, price, qty, *args)
 
                 inv.add_product(product)
                 print("Product added successfully.")
 
             elif choice == "2":
-                pid = input("Product ID: ")
+                pid = sys.intern(input("Product ID: "))
                 qty = int(input("Quantity to sell: "))
                 inv.sell_product(pid, qty)
                 print("Product sold successfully.")
 
             elif choice == "3":
-                pid = input("Product ID: ")
+                pid = sys.intern(input("Product ID: "))
                 qty = int(input("Quantity to restock: "))
                 inv.restock_product(pid, qty)
                 print("Product restocked successfully.")
@@ -257,6 +447,14 @@ def menu():
                 inv.load_from_file("inventory_data.json")
                 print("Inventory loaded from file.")
 
+            elif choice == "11":
+                inv.save_binary("inventory_data.pkl")
+                print("Inventory saved to binary file.")
+
+            elif choice == "12":
+                inv.load_binary("inventory_data.pkl")
+                print("Inventory loaded from binary file.")
+
             elif choice == "0":
                 print("Exiting system.")
                 break